@@ -30,6 +30,7 @@ The main easyconfig format class
 :author: Kenneth Hoste (Ghent University)
 """
 import copy
+import logging
 import re
 
 from easybuild.base import fancylogger
@@ -82,7 +83,9 @@ _log = fancylogger.getLogger('easyconfig.format.format', fname=False)
 
 def get_format_version(txt):
     """Get the easyconfig format version as EasyVersion instance."""
-    res = FORMAT_VERSION_REGEXP.search(txt)
+    # the format version marker is part of the header, so only the top of the file
+    # needs to be scanned, not the entire easyconfig
+    res = FORMAT_VERSION_REGEXP.search(txt[:4096])
     format_version = None
     if res is not None:
         try:
@@ -96,6 +99,9 @@ def get_format_version(txt):
 class NestedDict(dict):
     """A nested dictionary, with tracking of depth and parent"""
 
+    # avoid a per-instance __dict__; deeply nested easyconfigs create many of these
+    __slots__ = ('depth', 'parent')
+
     def __init__(self, parent, depth):
         """Initialise NestedDict instance"""
         dict.__init__(self)
@@ -108,21 +114,28 @@ class NestedDict(dict):
         return nd
 
     def copy(self):
-        """Return a copy. Any relation between key and value are deepcopied away."""
+        """
+        Return a copy. Any relation between key and value are copied away.
+        Keys are strings or (toolchain) version operator instances, which are never
+        modified after construction, so they are treated as immutable and not copied.
+        """
         nd = self.__class__(parent=self.parent, depth=self.depth)
         for key, val in self.items():
-            cp_key = copy.deepcopy(key)
             if isinstance(val, NestedDict):
-                cp_val = val.copy()
+                nd[key] = val.copy()
+            elif type(val) in (str, int, float, bool, type(None)):
+                # immutable values don't need a copy either
+                nd[key] = val
             else:
-                cp_val = copy.deepcopy(val)
-            nd[cp_key] = cp_val
+                nd[key] = copy.deepcopy(val)
         return nd
 
 
 class TopNestedDict(NestedDict):
     """The top level nested dictionary (depth 0, parent is itself)"""
 
+    __slots__ = ()
+
     def __init__(self, parent=None, depth=None):
         """Initialise TopNestedDict instance"""
         # parent and depth are ignored; just to support same init for copier
@@ -169,15 +182,16 @@ class Squashed(object):
 
     def final(self):
         """Final squashing of version and toolchainversion operators and return the result"""
-        self.log.debug('Pre-final result %s' % self.result)
-        self.log.debug('Pre-final versions %s with data %s' % (self.versions, self.versions.datamap))
-        self.log.debug('Pre-final tcversions %s with data %s' % (self.tcversions, self.tcversions.datamap))
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug('Pre-final result %s', self.result)
+            self.log.debug('Pre-final versions %s with data %s', self.versions, self.versions.datamap)
+            self.log.debug('Pre-final tcversions %s with data %s', self.tcversions, self.tcversions.datamap)
 
         # update self.result, most strict matching versionoperator should be first element
         # so update in reversed order
         # also update toolchain data before version data
         for vers in [self.tcversions, self.versions]:
-            for versop in vers.versops[::-1]:
+            for versop in reversed(vers.versops):
                 self.result.update(vers.get_data(versop))
 
         return self.result
@@ -215,6 +229,8 @@ class EBConfigObj(object):
         # versions: comma-separated list of version operators
         'versions': VersionOperator,
     }
+    # keys of VERSION_OPERATOR_VALUE_TYPES, as frozenset for fast membership tests
+    VERSION_OPERATOR_VALUE_KEYS = frozenset(VERSION_OPERATOR_VALUE_TYPES)
 
     def __init__(self, configobj=None):
         """
@@ -225,19 +241,32 @@ class EBConfigObj(object):
 
         self.tcname = None
 
+        # cache of section marker string -> parsed marker, since identical markers tend to recur
+        self._marker_cache = {}
+
         self.default = {}  # default section
         self.supported = {}  # supported section
+        # lookup structures derived from the supported section (filled in by parse)
+        self._supported_versions = ()
+        self._supported_tcs = {}
         self.sections = None  # all other sections
         self.unfiltered_sections = {}  # unfiltered other sections
 
         if configobj is not None:
             self.parse(configobj)
 
+    # prototype for _init_sections, built on first use and copied per instance
+    _SECTIONS_TEMPLATE = None
+
     def _init_sections(self):
         """Initialise self.sections. Make sure 'default' and 'supported' sections exist."""
-        self.sections = TopNestedDict()
-        for key in [self.SECTION_MARKER_DEFAULT, self.SECTION_MARKER_SUPPORTED]:
-            self.sections[key] = self.sections.get_nested_dict()
+        template = EBConfigObj._SECTIONS_TEMPLATE
+        if template is None:
+            template = TopNestedDict()
+            for key in [self.SECTION_MARKER_DEFAULT, self.SECTION_MARKER_SUPPORTED]:
+                template[key] = template.get_nested_dict()
+            EBConfigObj._SECTIONS_TEMPLATE = template
+        self.sections = template.copy()
 
     def parse_sections(self, toparse, current):
         """
@@ -251,13 +280,19 @@ class EBConfigObj(object):
         # note: configobj already converts comma-separated strings in lists
         #
         # list of supported keywords, all else will fail
-        special_keys = self.VERSION_OPERATOR_VALUE_TYPES.keys()
+        versop_value_types = self.VERSION_OPERATOR_VALUE_TYPES
+        special_keys = self.VERSION_OPERATOR_VALUE_KEYS
 
-        self.log.debug('Processing current depth %s' % current.depth)
+        # local alias, to avoid repeated attribute lookups in the loop below
+        debug = self.log.debug
+
+        debug('Processing current depth %s', current.depth)
 
         for key, value in toparse.items():
-            if isinstance(value, Section):
-                self.log.debug("Enter subsection key %s value %s" % (key, value))
+            # configobj only creates plain Section instances for subsections,
+            # so an exact type check suffices here (and is faster than isinstance)
+            if type(value) is Section:
+                debug("Enter subsection key %s value %s", key, value)
 
                 # only supported types of section keys are:
                 # * DEFAULT
@@ -267,58 +302,68 @@ class EBConfigObj(object):
                 if key in [self.SECTION_MARKER_DEFAULT, self.SECTION_MARKER_SUPPORTED]:
                     # parse value as a section, recursively
                     new_value = self.parse_sections(value, current.get_nested_dict())
-                    self.log.debug('Converted %s section to new value %s' % (key, new_value))
+                    debug('Converted %s section to new value %s', key, new_value)
                     current[key] = new_value
 
                 elif key == self.SECTION_MARKER_DEPENDENCIES:
                     new_key = 'dependencies'
-                    new_value = []
-                    for dep_name, dep_val in value.items():
-                        if isinstance(dep_val, Section):
-                            raise EasyBuildError("Unsupported nested section '%s' in dependencies section", dep_name)
-                        else:
-                            # FIXME: parse the dependency specification for version, toolchain, suffix, etc.
-                            dep = Dependency(dep_val, name=dep_name)
-                            if dep.name() is None or dep.version() is None:
-                                raise EasyBuildError("Failed to find name/version in parsed dependency: %s (dict: %s)",
-                                                     dep, dict(dep))
-                            new_value.append(dep)
+                    # nested sections are not supported here, check for them before constructing anything
+                    bad_deps = [dep_name for dep_name, dep_val in value.items() if type(dep_val) is Section]
+                    if bad_deps:
+                        raise EasyBuildError("Unsupported nested section '%s' in dependencies section", bad_deps[0])
+
+                    # FIXME: parse the dependency specification for version, toolchain, suffix, etc.
+                    new_value = [Dependency(dep_val, name=dep_name) for dep_name, dep_val in value.items()]
+                    for dep in new_value:
+                        if dep.name() is None or dep.version() is None:
+                            raise EasyBuildError("Failed to find name/version in parsed dependency: %s (dict: %s)",
+                                                 dep, dict(dep))
 
                     tmpl = 'Converted dependency section %s to %s, passed it to parent section (or default)'
-                    self.log.debug(tmpl % (key, new_value))
-                    if isinstance(current, TopNestedDict):
+                    debug(tmpl, key, new_value)
+                    if type(current) is TopNestedDict:
                         current[self.SECTION_MARKER_DEFAULT].update({new_key: new_value})
                     else:
                         current.parent[new_key] = new_value
                 else:
                     # try parsing key as toolchain version operator first
                     # try parsing as version operator if it's not a toolchain version operator
-                    for marker_type in self.KNOWN_VERSION_MARKER_TYPES:
-                        new_key = marker_type(key)
-                        if new_key:
-                            self.log.debug("'%s' was parsed as a %s section marker" % (key, marker_type.__name__))
-                            break
+                    # reuse markers that were parsed earlier, identical marker strings tend to recur
+                    new_key = self._marker_cache.get(key)
+                    if new_key is None:
+                        if key.split(VersionOperator.SEPARATOR, 1)[0] in VersionOperator.OPERATOR_MAP:
+                            # marker starts with an operator symbol (e.g. '> 2.0'),
+                            # so it can never be a toolchain version operator
+                            marker_types = [VersionOperator]
                         else:
-                            self.log.debug("Not a %s section marker" % marker_type.__name__)
-                    if not new_key:
-                        raise EasyBuildError("Unsupported section marker '%s'", key)
+                            marker_types = self.KNOWN_VERSION_MARKER_TYPES
+                        for marker_type in marker_types:
+                            new_key = marker_type(key)
+                            if new_key:
+                                debug("'%s' was parsed as a %s section marker", key, marker_type.__name__)
+                                break
+                            else:
+                                debug("Not a %s section marker", marker_type.__name__)
+                        if not new_key:
+                            raise EasyBuildError("Unsupported section marker '%s'", key)
+                        self._marker_cache[key] = new_key
 
                     # parse value as a section, recursively
                     new_value = self.parse_sections(value, current.get_nested_dict())
 
-                    self.log.debug("Converted section key %s value %s in new key %s new value %s",
-                                   key, value, new_key, new_value)
+                    debug("Converted section key %s value %s in new key %s new value %s",
+                          key, value, new_key, new_value)
                     current[new_key] = new_value
 
             else:
                 # simply pass down any non-special key-value items
                 if key not in special_keys:
-                    self.log.debug('Passing down key %s with value %s' % (key, value))
+                    debug('Passing down key %s with value %s', key, value)
                     new_value = value
 
                 # parse individual key-value assignments
-                elif key in self.VERSION_OPERATOR_VALUE_TYPES:
-                    value_type = self.VERSION_OPERATOR_VALUE_TYPES[key]
+                elif key in versop_value_types:
+                    value_type = versop_value_types[key]
                     # list of supported toolchains/versions
                     # first one is default
                     if isinstance(value, string_type):
@@ -328,13 +373,13 @@ class EBConfigObj(object):
                         value = value.split(',')
                     # remove possible surrounding whitespace (some people add space after comma)
                     new_value = [value_type(x.strip()) for x in value]
-                    if False in [x.is_valid() for x in new_value]:
+                    if any(not x.is_valid() for x in new_value):
                         raise EasyBuildError("Failed to parse '%s' as list of %s", value, value_type.__name__)
                 else:
                     raise EasyBuildError('Bug: supported but unknown key %s with non-string value: %s, type %s',
                                          key, value, type(value))
 
-                self.log.debug("Converted value '%s' for key '%s' into new value '%s'" % (value, key, new_value))
+                debug("Converted value '%s' for key '%s' into new value '%s'", value, key, new_value)
                 current[key] = new_value
 
         return current
@@ -353,40 +398,50 @@ class EBConfigObj(object):
         self._init_sections()
         self.sections = self.parse_sections(self.configobj, self.sections)
 
-        # handle default section
-        # no nesting
+        # handle default and supported sections in a single pass
+        sections = self.sections
+        # default section: no nesting
         #  - add DEFAULT key-value entries to the root of self.sections
         #  - key-value items from other sections will be deeper down
         #  - deepest level is best match and wins, so defaults are on top level
-        self.default = self.sections.pop(self.SECTION_MARKER_DEFAULT)
-        for key, value in self.default.items():
-            self.sections[key] = value
-
-        # handle supported section
-        # supported should only have 'versions' and 'toolchains' keys
-        self.supported = self.sections.pop(self.SECTION_MARKER_SUPPORTED)
-        for key, value in self.supported.items():
-            if key not in self.VERSION_OPERATOR_VALUE_TYPES:
+        default = self.default = sections.pop(self.SECTION_MARKER_DEFAULT)
+        # supported section should only have 'versions' and 'toolchains' keys
+        supported = self.supported = sections.pop(self.SECTION_MARKER_SUPPORTED)
+
+        sections.update(default)
+
+        special_keys = self.VERSION_OPERATOR_VALUE_KEYS
+        for key, value in supported.items():
+            if key not in special_keys:
                 raise EasyBuildError('Unsupported key %s in %s section', key, self.SECTION_MARKER_SUPPORTED)
-            self.sections['%s' % key] = value
+            # supported keys are always plain strings, no need to coerce them
+            sections[key] = value
 
         for key, supported_key, fn_name in [('version', 'versions', 'get_version_str'),
                                             ('toolchain', 'toolchains', 'as_dict')]:
-            if supported_key in self.supported:
-                self.log.debug('%s in supported section, trying to determine default for %s' % (supported_key, key))
-                first = self.supported[supported_key][0]
+            if supported_key in supported:
+                self.log.debug('%s in supported section, trying to determine default for %s', supported_key, key)
+                first = supported[supported_key][0]
                 f_val = getattr(first, fn_name)()
                 if f_val is None:
                     raise EasyBuildError("First %s %s can't be used as default (%s returned None)", key, first, fn_name)
                 else:
-                    self.log.debug('Using first %s (%s) as default %s' % (key, first, f_val))
-                    self.default[key] = f_val
+                    self.log.debug('Using first %s (%s) as default %s', key, first, f_val)
+                    default[key] = f_val
+
+        # precompute lookup structures on the supported versions/toolchains,
+        # so get_version_toolchain doesn't have to rescan the supported section on every call
+        self._supported_versions = tuple(x.get_version_str() for x in supported.get('versions', []))
+        self._supported_tcs = {}
+        for tc in supported.get('toolchains', []):
+            self._supported_tcs.setdefault(tc.tc_name, []).append(tc)
 
         # TODO is it verified somewhere that the defaults are supported?
 
-        self.log.debug("(parse) supported: %s" % self.supported)
-        self.log.debug("(parse) default: %s" % self.default)
-        self.log.debug("(parse) sections: %s" % self.sections)
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("(parse) supported: %s", self.supported)
+            self.log.debug("(parse) default: %s", self.default)
+            self.log.debug("(parse) sections: %s", self.sections)
 
     def squash(self, version, tcname, tcversion):
         """
@@ -397,7 +452,7 @@ class EBConfigObj(object):
         :param tcname: toolchain name to keep
         :param tcversion: toolchain version to keep
         """
-        self.log.debug('Start squash with sections %s' % self.sections)
+        self.log.debug('Start squash with sections %s', self.sections)
 
         # dictionary to keep track of all sections, to detect conflicts in the easyconfig
         sanity = {
@@ -409,90 +464,127 @@ class EBConfigObj(object):
         squashed = self._squash(vt_tuple, self.sections, sanity)
         result = squashed.final()
 
-        self.log.debug('End squash with result %s' % result)
+        self.log.debug('End squash with result %s', result)
         return result
 
     def _squash(self, vt_tuple, processed, sanity):
         """
         Project the multidimensional easyconfig (or subsection thereof) to single easyconfig
         Returns Squashed instance for the processed block.
+
+        Implemented with an explicit work stack rather than recursion, so deeply nested
+        easyconfigs don't pay the per-call frame overhead or hit Python's recursion limit.
+
         :param vt_tuple: tuple with version (version to keep), tcname (toolchain name to keep) and
                             tcversion (toolchain version to keep)
         :param processed: easyconfig (Top)NestedDict
         :param sanity: dictionary to keep track of section markers and detect conflicts
         """
         version, tcname, tcversion = vt_tuple
-        res_sections = {}
-
-        # a Squashed instance to keep track of the data of the matching version and toolchainversion sections
-        # also contains the intermediate result
-        squashed = Squashed()
-
-        self.log.debug('Start processed %s' % processed)
-        # walk over dictionary of parsed sections, and check for marker conflicts (using .add())
-        for key, value in processed.items():
-            if isinstance(value, NestedDict):
-                tmp = self._squash_netsed_dict(key, value, squashed, sanity, vt_tuple)
-                res_sections.update(tmp)
-            elif key in self.VERSION_OPERATOR_VALUE_TYPES:
-                self.log.debug("Found VERSION_OPERATOR_VALUE_TYPES entry (%s)" % key)
-                tmp = self._squash_versop(key, value, squashed, sanity, vt_tuple)
-                if tmp is not None:
-                    return tmp
-            else:
-                self.log.debug('Adding key %s value %s' % (key, value))
-                squashed.result[key] = value
-
-        # merge the current attributes with deeper nested ones, deepest nested ones win
-        self.log.debug('Current level result %s' % squashed.result)
-        self.log.debug('Higher level sections result %s' % res_sections)
-        squashed.result.update(res_sections)
 
-        self.log.debug('End processed %s ordered versions %s result %s' %
-                       (processed, squashed.versions, squashed.result))
-        return squashed
-
-    def _squash_netsed_dict(self, key, nested_dict, squashed, sanity, vt_tuple):
-        """
-        Squash NestedDict instance, returns dict with already squashed data
-            from possible higher sections
-        :param key: section key
-        :param nested_dict: the nested_dict instance
-        :param squashed: Squashed instance
-        :param sanity: the sanity dict
-        :param vt_tuple: version, tc_name, tc_version tuple
-        """
-        version, tcname, tcversion = vt_tuple
-        res_sections = {}
-
-        if isinstance(key, ToolchainVersionOperator):
-            # perform sanity check for all toolchains, use .add to check for conflicts
-            tc_overops = sanity['toolchains'].setdefault(key.tc_name, OrderedVersionOperators())
-            tc_overops.add(key)
-
-            if key.test(tcname, tcversion):
-                self.log.debug("Found matching marker for specified toolchain '%s, %s': %s", tcname, tcversion, key)
-                # TODO remove when unifying add_toolchina with .add()
-                tmp_squashed = self._squash(vt_tuple, nested_dict, sanity)
-                res_sections.update(tmp_squashed.result)
-                squashed.add_toolchain(tmp_squashed)
-            else:
-                tmpl = "Found marker for other toolchain or version '%s', ignoring this (nested) section."
-                self.log.debug(tmpl % key)
-        elif isinstance(key, VersionOperator):
-            # keep track of all version operators, and enforce conflict check
-            sanity['versops'].add(key)
-            if key.test(version):
-                self.log.debug('Found matching version marker %s' % key)
-                squashed.add_version(key, self._squash(vt_tuple, nested_dict, sanity))
+        # local aliases, to avoid repeated attribute lookups in the loop below
+        debug = self.log.debug
+        versop_value_types = self.VERSION_OPERATOR_VALUE_TYPES
+
+        # memoise marker test results for the duration of this squash;
+        # the same marker instances are typically tested again in nested sections
+        # (markers are never modified once parsed, so keying on identity is safe)
+        tc_memo = {}
+        ver_memo = {}
+
+        # one frame per (nested) section being squashed:
+        # [items iterator, Squashed instance, squashed data from nested toolchain sections,
+        #  version marker to merge the result under in the parent (None for toolchain sections and the top)]
+        # a Squashed instance keeps track of the data of the matching version and toolchainversion sections,
+        # and also contains the intermediate result
+        stack = [[iter(processed.items()), Squashed(), {}, None]]
+        final_squashed = None
+
+        while stack:
+            frame = stack[-1]
+            items, squashed, res_sections = frame[0], frame[1], frame[2]
+            descended = False
+            aborted = False
+
+            # walk over dictionary of parsed sections, and check for marker conflicts (using .add())
+            for key, value in items:
+                if type(value) in (NestedDict, TopNestedDict):
+                    # exact type check, since ToolchainVersionOperator subclasses VersionOperator
+                    key_type = type(key)
+                    if key_type is ToolchainVersionOperator:
+                        # perform sanity check for all toolchains, use .add to check for conflicts
+                        tc_overops = sanity['toolchains'].setdefault(key.tc_name, OrderedVersionOperators())
+                        tc_overops.add(key)
+
+                        res = tc_memo.get(id(key))
+                        if res is None:
+                            res = tc_memo[id(key)] = key.test(tcname, tcversion)
+                        if res:
+                            debug("Found matching marker for specified toolchain '%s, %s': %s",
+                                  tcname, tcversion, key)
+                            # suspend this frame, squash the nested section first
+                            stack.append([iter(value.items()), Squashed(), {}, None])
+                            descended = True
+                            break
+                        else:
+                            debug("Found marker for other toolchain or version '%s', "
+                                  "ignoring this (nested) section.", key)
+                    elif key_type is VersionOperator:
+                        # keep track of all version operators, and enforce conflict check
+                        sanity['versops'].add(key)
+                        res = ver_memo.get(id(key))
+                        if res is None:
+                            res = ver_memo[id(key)] = key.test(version)
+                        if res:
+                            debug('Found matching version marker %s', key)
+                            stack.append([iter(value.items()), Squashed(), {}, key])
+                            descended = True
+                            break
+                        else:
+                            debug('Found non-matching version marker %s. Ignoring this (nested) section.', key)
+                    else:
+                        raise EasyBuildError("Unhandled section marker '%s' (type '%s')", key, type(key))
+                elif key in versop_value_types:
+                    debug("Found VERSION_OPERATOR_VALUE_TYPES entry (%s)", key)
+                    tmp = self._squash_versop(key, value, squashed, sanity, vt_tuple, tc_memo, ver_memo)
+                    if tmp is not None:
+                        # no matching toolchains/versions at all, drop this whole section
+                        frame[1] = squashed = tmp
+                        aborted = True
+                        break
+                else:
+                    debug('Adding key %s value %s', key, value)
+                    squashed.result[key] = value
+
+            if descended:
+                # process the nested section first; this frame resumes where it left off
+                continue
+
+            if not aborted:
+                # merge the current attributes with deeper nested ones, deepest nested ones win
+                debug('Current level result %s', squashed.result)
+                debug('Higher level sections result %s', res_sections)
+                squashed.result.update(res_sections)
+
+            # this (sub)section is done, fold its result back into the parent frame
+            stack.pop()
+            if stack:
+                parent = stack[-1]
+                versop = frame[3]
+                if versop is None:
+                    # nested toolchain section
+                    # TODO remove when unifying add_toolchain with .add()
+                    parent[2].update(squashed.result)
+                    parent[1].add_toolchain(squashed)
+                else:
+                    # nested version section
+                    parent[1].add_version(versop, squashed)
             else:
-                self.log.debug('Found non-matching version marker %s. Ignoring this (nested) section.' % key)
-        else:
-            raise EasyBuildError("Unhandled section marker '%s' (type '%s')", key, type(key))
+                final_squashed = squashed
 
-        return res_sections
+        return final_squashed
 
-    def _squash_versop(self, key, value, squashed, sanity, vt_tuple):
+    def _squash_versop(self, key, value, squashed, sanity, vt_tuple, tc_memo, ver_memo):
         """
         Squash VERSION_OPERATOR_VALUE_TYPES value
             return None or new Squashed instance
@@ -501,6 +593,8 @@ class EBConfigObj(object):
         :param squashed: Squashed instance
         :param sanity: the sanity dict
         :param vt_tuple: version, tc_name, tc_version tuple
+        :param tc_memo: memo dict with toolchain version marker test results for this squash
+        :param ver_memo: memo dict with version marker test results for this squash
         """
         version, tcname, tcversion = vt_tuple
         if key == 'toolchains':
@@ -514,29 +608,35 @@ class EBConfigObj(object):
                 self.log.debug("Add tcversop %s to tc_overops %s tcname %s tcversion %s",
                                tcversop, tc_overops, tcname, tcversion)
                 tc_overops.add(tcversop)  # test non-conflicting list
-                if tcversop.test(tcname, tcversion):
+                res = tc_memo.get(id(tcversop))
+                if res is None:
+                    res = tc_memo[id(tcversop)] = tcversop.test(tcname, tcversion)
+                if res:
                     matching_toolchains.append(tcversop)
 
             if matching_toolchains:
                 # does this have any use?
-                self.log.debug('Matching toolchains %s found (but data not needed)' % matching_toolchains)
+                self.log.debug('Matching toolchains %s found (but data not needed)', matching_toolchains)
             else:
-                self.log.debug('No matching toolchains, removing the whole current key %s' % key)
+                self.log.debug('No matching toolchains, removing the whole current key %s', key)
                 return Squashed()
 
         elif key == 'versions':
-            self.log.debug("Adding all versions %s from versions key" % value)
+            self.log.debug("Adding all versions %s from versions key", value)
             matching_versions = []
             tmp_versops = OrderedVersionOperators()  # temporary, only for conflict checking
             for versop in value:
                 tmp_versops.add(versop)  # test non-conflicting list
-                if versop.test(version):
+                res = ver_memo.get(id(versop))
+                if res is None:
+                    res = ver_memo[id(versop)] = versop.test(version)
+                if res:
                     matching_versions.append(versop)
             if matching_versions:
                 # does this have any use?
-                self.log.debug('Matching versions %s found (but data not needed)' % matching_versions)
+                self.log.debug('Matching versions %s found (but data not needed)', matching_versions)
             else:
-                self.log.debug('No matching versions, removing the whole current key %s' % key)
+                self.log.debug('No matching versions, removing the whole current key %s', key)
                 return Squashed()
         else:
             raise EasyBuildError('Unexpected VERSION_OPERATOR_VALUE_TYPES key %s value %s', key, value)
@@ -546,7 +646,7 @@ class EBConfigObj(object):
     def get_version_toolchain(self, version=None, tcname=None, tcversion=None):
         """Return tuple of version, toolchainname and toolchainversion (possibly using defaults)."""
         # make sure that requested version/toolchain are supported by this easyconfig
-        versions = [x.get_version_str() for x in self.supported['versions']]
+        versions = self._supported_versions
         if version is None:
             if 'version' in self.default:
                 version = self.default['version']
@@ -558,7 +658,7 @@ class EBConfigObj(object):
         else:
             raise EasyBuildError("Version '%s' not supported in easyconfig (only %s)", version, versions)
 
-        tcnames = [tc.tc_name for tc in self.supported['toolchains']]
+        tcnames = list(self._supported_tcs)
         if tcname is None:
             if 'toolchain' in self.default and 'name' in self.default['toolchain']:
                 tcname = self.default['toolchain']['name']
@@ -570,7 +670,7 @@ class EBConfigObj(object):
         else:
             raise EasyBuildError("Toolchain '%s' not supported in easyconfig (only %s)", tcname, tcnames)
 
-        tcs = [tc for tc in self.supported['toolchains'] if tc.tc_name == tcname]
+        tcs = self._supported_tcs.get(tcname, [])
         if tcversion is None:
             if 'toolchain' in self.default and 'version' in self.default['toolchain']:
                 tcversion = self.default['toolchain']['version']
@@ -593,7 +693,7 @@ class EBConfigObj(object):
         """
 
         version, tcname, tcversion = self.get_version_toolchain(version, tcname, tcversion)
-        self.log.debug('Squashing with version %s and toolchain %s' % (version, (tcname, tcversion)))
+        self.log.debug('Squashing with version %s and toolchain %s', version, (tcname, tcversion))
         res = self.squash(version, tcname, tcversion)
 
         return res
@@ -618,10 +718,19 @@ class EasyConfigFormat(object):
 
         self.specs = {}
 
-    def set_specifications(self, specs):
-        """Set specifications."""
-        self.log.debug('Set copy of specs %s' % specs)
-        self.specs = copy.deepcopy(specs)
+    def set_specifications(self, specs, deep=True):
+        """
+        Set specifications.
+        :param deep: copy the mutable values of specs, so later changes by the caller don't leak in;
+                     disable if the caller hands over ownership of specs
+        """
+        self.log.debug('Set copy of specs %s', specs)
+        if deep:
+            # immutable values (version strings, ...) don't need to be copied
+            self.specs = dict((key, copy.deepcopy(val) if isinstance(val, (dict, list)) else val)
+                              for key, val in specs.items())
+        else:
+            self.specs = dict(specs)
 
     def get_config_dict(self):
         """Returns a single easyconfig dictionary."""
@@ -644,10 +753,26 @@ class EasyConfigFormat(object):
         raise NotImplementedError
 
 
+# cache mapping format version to matching usable EasyConfigFormat subclasses,
+# rebuilt whenever the number of known subclasses changes
+_FORMAT_VERSION_CLASS_CACHE = {}
+_FORMAT_VERSION_CLASS_COUNT = -1
+
+
 def get_format_version_classes(version=None):
     """Return the (usable) subclasses from EasyConfigFormat that have a matching version."""
+    global _FORMAT_VERSION_CLASS_COUNT
+
     all_classes = get_subclasses(EasyConfigFormat)
     if version is None:
         return all_classes
-    else:
-        return [x for x in all_classes if x.VERSION == version and x.USABLE]
+
+    if len(all_classes) != _FORMAT_VERSION_CLASS_COUNT:
+        # (re)build the version -> classes index, new format subclasses were defined
+        _FORMAT_VERSION_CLASS_CACHE.clear()
+        for cls in all_classes:
+            if cls.USABLE:
+                _FORMAT_VERSION_CLASS_CACHE.setdefault(cls.VERSION, []).append(cls)
+        _FORMAT_VERSION_CLASS_COUNT = len(all_classes)
+
+    return list(_FORMAT_VERSION_CLASS_CACHE.get(version, []))
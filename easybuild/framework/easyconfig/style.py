@@ -50,15 +50,17 @@ except ImportError:
 
 _log = fancylogger.getLogger('easyconfig.style', fname=False)
 
-EB_CHECK = '_eb_check_'
-
 COMMENT_REGEX = re.compile(r'^\s*#')
 PARAM_DEF_REGEX = re.compile(r"^(?P<key>[a-z_]+)\s*=\s*")
 
 MAX_LINE_LENGTH = 120
 
+# tracks whether the style checks were initialised (module reload + registration of custom checks),
+# which only needs to happen once per process (see check_easyconfigs_style)
+_style_checks_initialized = False
+
 
-# Any function starting with _eb_check_ (see EB_CHECK variable) will be
+# Any function decorated with @_register_eb_check will be
 # added to the tests if the test number is added to the select list.
 #
 # Note: only functions that have a first argument named 'physical_line' or 'logical_line'
@@ -72,6 +74,17 @@ MAX_LINE_LENGTH = 120
 # https://pycodestyle.readthedocs.io or more specifically:
 # https://pycodestyle.readthedocs.io/en/latest/developer.html#contribute
 
+# registry of custom easyconfig style check functions
+_EB_CHECKS = []
+
+
+def _register_eb_check(func):
+    """Decorator to register a custom style check function for use by check_easyconfigs_style."""
+    _EB_CHECKS.append(func)
+    return func
+
+
+@_register_eb_check
 def _eb_check_trailing_whitespace(physical_line, lines, line_number, checker_state):  # pylint:disable=unused-argument
     """
     W299
@@ -112,19 +125,23 @@ def check_easyconfigs_style(easyconfigs, verbose=False):
     :param: verbose print our statistics and be verbose about the errors and warning
     :return: the number of warnings and errors
     """
-    # importing autopep8 changes some pep8 functions.
-    # We reload it to be sure to get the real pep8 functions.
-    if 'pycodestyle' in sys.modules:
-        reload(pycodestyle)
-    else:
-        reload(pep8)
-
-    # register the extra checks before using pep8:
-    # any function in this module starting with `_eb_check_` will be used.
-    cands = globals()
-    for check_function in sorted([cands[f] for f in cands if callable(cands[f]) and f.startswith(EB_CHECK)]):
-        _log.debug("Adding custom style check %s", check_function)
-        register_check(check_function)
+    global _style_checks_initialized
+    if not _style_checks_initialized:
+        # importing autopep8 changes some pep8 functions.
+        # We reload it to be sure to get the real pep8 functions.
+        # Reloading is expensive (it re-executes the whole module), so only do it once per process.
+        if 'pycodestyle' in sys.modules:
+            reload(pycodestyle)
+        else:
+            reload(pep8)
+
+        # register the extra checks before using pep8:
+        # any function in this module decorated with @_register_eb_check will be used.
+        for check_function in sorted(_EB_CHECKS, key=lambda f: f.__name__):
+            _log.debug("Adding custom style check %s", check_function)
+            register_check(check_function)
+
+        _style_checks_initialized = True
 
     styleguide = StyleGuide(quiet=False, config_file=None)
     options = styleguide.options